@@ -0,0 +1,136 @@
+# benchmarks/bench_page_frames.py
+"""
+Compare the old dict-append DataFrame build (ORM objects, nested loops)
+against the columnar fetch in workflow.actions.
+
+Runs on a throwaway in-memory SQLite DB:
+    python benchmarks/bench_page_frames.py [donations] [items_per_donation]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from workflow.db import Base
+from workflow.model import User, FoodDonation, Distribution
+from workflow.actions import (
+    get_user_donations,
+    get_all_donations,
+    get_distribution_history,
+    get_user_donation_items,
+    get_all_donation_items,
+    get_user_distributed_items,
+)
+
+ITEMS = ["rice", "dal", "oil", "flour", "sugar", "salt", "milk", "tea", "soap", "biscuits"]
+
+
+def seed(db, n_donations: int, items_per: int):
+    users = [User(email=f"u{i}@x.org", username=f"u{i}", password="x") for i in range(10)]
+    db.add_all(users)
+    db.flush()
+
+    for i in range(n_donations):
+        db.add(FoodDonation(
+            user_id=users[i % len(users)].user_id,
+            quantity=[{"item": random.choice(ITEMS), "qty": random.randint(1, 20)}
+                      for _ in range(items_per)],
+        ))
+    for i in range(n_donations // 10):
+        db.add(Distribution(
+            user_id=users[0].user_id, address=f"{i} Main St", state="WB",
+            quantity=[{"item": random.choice(ITEMS), "qty": random.randint(1, 5)}
+                      for _ in range(items_per)],
+        ))
+    db.commit()
+    return users[1].user_id
+
+
+# --- old page logic (copied from main.py before the columnar path) ---
+def old_my_donations(db, user_id):
+    rows = []
+    for d in get_user_donations(db, user_id):
+        for item in d.quantity:
+            rows.append({"Donation ID": d.donation_id, "Item": item["item"], "Quantity": item["qty"]})
+    return pd.DataFrame(rows)
+
+
+def old_admin_manage(db):
+    rows = []
+    for d in get_all_donations(db):
+        for item in d.quantity:
+            rows.append({"Donation ID": d.donation_id, "User ID": d.user_id,
+                         "Item": item["item"], "Quantity": item["qty"]})
+    return pd.DataFrame(rows)
+
+
+def old_where_donated(db, user_id):
+    dist = get_distribution_history(db)
+    user_items = []
+    for d in get_user_donations(db, user_id):
+        for item in d.quantity:
+            user_items.append(item["item"].lower())
+    rows = []
+    for dis in dist:
+        for item in dis.quantity:
+            if item["item"].lower() in user_items:
+                rows.append({"Distribution ID": dis.distribution_id, "Address": dis.address,
+                             "State": dis.state, "Item Distributed": item["item"],
+                             "Quantity": item["qty"]})
+    return pd.DataFrame(rows)
+
+
+def run(Session, fn):
+    with Session() as db:
+        return fn(db)
+
+
+def timed(fn, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    n_donations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    items_per = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as db:
+        user_id = seed(db, n_donations, items_per)
+
+    cases = [
+        ("My Donations", lambda db: old_my_donations(db, user_id),
+         lambda db: get_user_donation_items(db, user_id, output="pandas")
+         [["donation_id", "item", "qty"]]),
+        ("Manage Donations", old_admin_manage,
+         lambda db: get_all_donation_items(db, output="pandas")),
+        ("Where Did My Food Go?", lambda db: old_where_donated(db, user_id),
+         lambda db: get_user_distributed_items(db, user_id, output="pandas")),
+    ]
+
+    print(f"{n_donations} donations x {items_per} items")
+    for name, old, new in cases:
+        # fresh session per run so the identity map doesn't hide ORM hydration cost
+        t_old, df_old = timed(lambda: run(Session, old))
+        t_new, df_new = timed(lambda: run(Session, new))
+        assert df_old.to_numpy().tolist() == df_new.to_numpy().tolist(), name
+        print(f"{name:<24} dict-append {t_old * 1000:8.1f} ms   "
+              f"columnar {t_new * 1000:8.1f} ms   rows {len(df_new):>7}   "
+              f"x{t_old / t_new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
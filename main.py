@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from workflow.db import SessionLocal
 from workflow.auth import (
     authenticate_user,
@@ -7,13 +8,23 @@ from workflow.auth import (
     create_and_send_otp,
     verify_otp,
 )
+from workflow.rate_limit import RateLimitExceeded
 from workflow.actions import (
     add_donation,
-    get_user_donations,
-    get_distribution_history,
-    get_all_donations,
+    merge_items,
     get_stock_overview,
-    add_distribution
+    add_distribution,
+    get_user_donation_items,
+    get_all_donation_items,
+    get_user_distributed_items,
+)
+from workflow.profiling import (
+    PROFILE_ENABLED,
+    PROFILE_KEEP,
+    profile_render,
+    get_recent_renders,
+    collapsed_stacks,
+    hotspots,
 )
 
 # ---------------------------------------------------------
@@ -24,6 +35,11 @@ st.set_page_config(page_title="Food Donation App", layout="wide")
 def get_db():
     return SessionLocal()
 
+def get_session_id():
+    # Streamlit browser-session id, used as a rate-limit key
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
 # ---------------------------------------------------------
 # LOGIN (STEP 1): PASSWORD AUTH
 # ---------------------------------------------------------
@@ -35,19 +51,28 @@ def login_page():
 
     if st.button("Login", key="login_button"):
         db = get_db()
-        user = authenticate_user(db, email, password)
+        try:
+            user = authenticate_user(db, email, password, session_id=get_session_id())
+        except RateLimitExceeded as e:
+            st.error(str(e))
+            return
 
         if not user:
             st.error("Invalid email or password.")
             return
 
+        # Send OTP
+        try:
+            create_and_send_otp(email, db, session_id=get_session_id())
+        except RateLimitExceeded as e:
+            st.error(str(e))
+            return
+
         # Save temp session for OTP stage
         st.session_state.temp_email = email
         st.session_state.temp_role = user.role
         st.session_state.temp_user_id = user.user_id
 
-        # Send OTP
-        create_and_send_otp(email, db)
         st.session_state.otp_stage = True
         st.success("OTP sent to your email!")
         st.rerun()
@@ -89,7 +114,11 @@ def otp_page():
 
     if st.button("Resend OTP", key="otp_resend_button"):
         db = get_db()
-        create_and_send_otp(st.session_state.temp_email, db)
+        try:
+            create_and_send_otp(st.session_state.temp_email, db, session_id=get_session_id())
+        except RateLimitExceeded as e:
+            st.error(str(e))
+            return
         st.success("New OTP sent to your email!")
 
 
@@ -165,33 +194,50 @@ def page_user_donate():
     item = st.text_input("Food Item", key="donate_item")
     qty = st.number_input("Quantity", min_value=1, key="donate_qty")
 
+    if "donate_items" not in st.session_state:
+        st.session_state.donate_items = []
+
+    if st.button("Add Item", key="donate_add_item"):
+        if not item.strip():
+            st.error("Enter a food item.")
+        else:
+            # Same item added twice → one line with the summed quantity
+            st.session_state.donate_items = merge_items(
+                st.session_state.donate_items + [{"item": item, "qty": qty}]
+            )
+            st.success("Item added.")
+
+    if st.session_state.donate_items:
+        st.write("📦 Items to Donate:")
+        df = pd.DataFrame(st.session_state.donate_items)
+        st.dataframe(df, use_container_width=True)
+
     if st.button("Submit Donation", key="donate_button"):
+        if not st.session_state.donate_items:
+            st.error("Add at least one item.")
+            return
+
         db = get_db()
-        payload = [{"item": item, "qty": qty}]
-        add_donation(db, st.session_state.user_id, payload)
+        add_donation(db, st.session_state.user_id, st.session_state.donate_items)
         st.success("Donation recorded successfully!")
+        st.session_state.donate_items = []
 
 
 def page_user_my_donations():
     st.header("My Donations")
 
     db = get_db()
-    donations = get_user_donations(db, st.session_state.user_id)
+    df = get_user_donation_items(db, st.session_state.user_id, output="pandas")
 
-    if not donations:
+    if df.empty:
         st.info("You have not made any donations yet.")
         return
 
-    rows = []
-    for d in donations:
-        for item in d.quantity:
-            rows.append({
-                "Donation ID": d.donation_id,
-                "Item": item["item"],
-                "Quantity": item["qty"]
-            })
-
-    df = pd.DataFrame(rows)
+    df = df[["donation_id", "item", "qty"]].rename(columns={
+        "donation_id": "Donation ID",
+        "item": "Item",
+        "qty": "Quantity",
+    })
     st.dataframe(df, use_container_width=True)
 
 
@@ -199,31 +245,19 @@ def page_user_where_donated():
     st.header("Where Did My Donations Go?")
 
     db = get_db()
-    dist = get_distribution_history(db)
-    donations = get_user_donations(db, st.session_state.user_id)
-
-    user_items = []
-    for d in donations:
-        for item in d.quantity:
-            user_items.append(item["item"].lower())
-
-    rows = []
-    for dis in dist:
-        for item in dis.quantity:
-            if item["item"].lower() in user_items:
-                rows.append({
-                    "Distribution ID": dis.distribution_id,
-                    "Address": dis.address,
-                    "State": dis.state,
-                    "Item Distributed": item["item"],
-                    "Quantity": item["qty"]
-                })
-
-    if not rows:
+    df = get_user_distributed_items(db, st.session_state.user_id, output="pandas")
+
+    if df.empty:
         st.info("Your donated items have not been distributed yet.")
         return
 
-    df = pd.DataFrame(rows)
+    df = df.rename(columns={
+        "distribution_id": "Distribution ID",
+        "address": "Address",
+        "state": "State",
+        "item": "Item Distributed",
+        "qty": "Quantity",
+    })
     st.dataframe(df, use_container_width=True)
 
 
@@ -235,23 +269,18 @@ def page_admin_manage():
     st.header("Manage All Donations")
 
     db = get_db()
-    donations = get_all_donations(db)
+    df = get_all_donation_items(db, output="pandas")
 
-    if not donations:
+    if df.empty:
         st.info("No donation entries found.")
         return
 
-    rows = []
-    for d in donations:
-        for item in d.quantity:
-            rows.append({
-                "Donation ID": d.donation_id,
-                "User ID": d.user_id,
-                "Item": item["item"],
-                "Quantity": item["qty"]
-            })
-
-    df = pd.DataFrame(rows)
+    df = df.rename(columns={
+        "donation_id": "Donation ID",
+        "user_id": "User ID",
+        "item": "Item",
+        "qty": "Quantity",
+    })
     st.dataframe(df, use_container_width=True)
 
 
@@ -312,10 +341,72 @@ def page_admin_record_distribution():
         st.session_state.dist_items = []
 
 
+def page_admin_profiling():
+    st.header("Page Profiling")
+
+    renders = get_recent_renders()
+
+    if not renders:
+        st.info("No page renders profiled yet.")
+        return
+
+    st.caption(f"Last {PROFILE_KEEP} page renders across all sessions (newest first).")
+    df = pd.DataFrame([
+        {
+            "Page": r["page"],
+            "Time": pd.to_datetime(r["at"], unit="s"),
+            "Wall (ms)": r["wall_ms"],
+            "CPU (ms)": r["cpu_ms"],
+            "Allocated (KB)": r["alloc_kb"],
+            "Peak (KB)": r["peak_kb"],
+            "Samples": r["samples"],
+        }
+        for r in renders
+    ])
+    st.dataframe(df.round(1), use_container_width=True)
+
+    st.download_button(
+        "Download flamegraph stacks (all renders)",
+        collapsed_stacks(renders),
+        file_name="pages.folded",
+        key="prof_all_stacks",
+    )
+
+    idx = st.selectbox(
+        "Render",
+        range(len(renders)),
+        format_func=lambda i: f"{renders[i]['page']} — {renders[i]['wall_ms']:.1f} ms",
+        key="prof_render",
+    )
+    selected = renders[idx]
+    top = hotspots(selected)
+
+    st.download_button(
+        "Download flamegraph stacks",
+        collapsed_stacks([selected]),
+        file_name=f"{selected['page']}.folded",
+        key="prof_stacks",
+    )
+    st.download_button(
+        "Download hotspots",
+        top,
+        file_name=f"{selected['page']}_hotspots.txt",
+        key="prof_hotspots",
+    )
+    st.code(top)
+
+
 # ---------------------------------------------------------
 # MAIN APP (Role-Based)
 # ---------------------------------------------------------
 
+def render(page):
+    # Opt-in per-render profiling (PROFILE_PAGES=1)
+    if PROFILE_ENABLED:
+        return profile_render(page)
+    return page()
+
+
 def main():
     if "email" not in st.session_state:
         st.session_state.email = None
@@ -343,25 +434,31 @@ def main():
             key="user_menu"
         )
         if menu == "Donate":
-            page_user_donate()
+            render(page_user_donate)
         elif menu == "My Donations":
-            page_user_my_donations()
+            render(page_user_my_donations)
         elif menu == "Where Did My Food Go?":
-            page_user_where_donated()
+            render(page_user_where_donated)
 
     # ADMIN
     elif st.session_state.role == "admin":
+        admin_pages = ["Manage Donations", "Stock Overview", "Record Distribution"]
+        if PROFILE_ENABLED:
+            admin_pages.append("Profiling")
+
         menu = st.sidebar.radio(
             "Admin Menu",
-            ["Manage Donations", "Stock Overview", "Record Distribution"],
+            admin_pages,
             key="admin_menu"
         )
         if menu == "Manage Donations":
-            page_admin_manage()
+            render(page_admin_manage)
         elif menu == "Stock Overview":
-            page_admin_stock()
+            render(page_admin_stock)
         elif menu == "Record Distribution":
-            page_admin_record_distribution()
+            render(page_admin_record_distribution)
+        elif menu == "Profiling":
+            page_admin_profiling()
 
     # ORG
     elif st.session_state.role == "org":
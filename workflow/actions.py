@@ -1,10 +1,31 @@
 # crud.py
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
 from workflow.model import FoodDonation, Distribution
 
 
-# 1) User → Add Donation
+def merge_items(quantity: list) -> list:
+    """
+    Collapse duplicate line items into one entry per item.
+    [{"item": "Rice", "qty": 2}, {"item": "rice ", "qty": 3}] -> [{"item": "rice", "qty": 5}]
+    Names are stripped and lower-cased to match stock / distribution lookups.
+    """
+    merged = {}
+    for entry in quantity:
+        name = entry["item"].strip().lower()
+        if not name:
+            continue
+        merged[name] = merged.get(name, 0) + entry["qty"]
+
+    return [{"item": name, "qty": qty} for name, qty in merged.items()]
+
+
+# 1) User → Add Donation (any number of items, one row / one commit)
 def add_donation(db: Session, user_id: int, quantity: list):
+    quantity = merge_items(quantity)
+    if not quantity:
+        raise ValueError("A donation needs at least one item.")
+
     donation = FoodDonation(user_id=user_id, quantity=quantity)
     db.add(donation)
     db.commit()
@@ -86,3 +107,92 @@ def add_distribution(db, user_id: int, address: str, state: str, quantity: list)
     db.refresh(new_dis)
 
     return new_dis
+
+
+# ------------------------------------------------------
+# COLUMNAR LINE ITEMS (Core select, no ORM hydration)
+# ------------------------------------------------------
+def _line_items(model):
+    """
+    Table-valued json_each() over a model's quantity column,
+    so each {"item", "qty"} entry comes back as its own row.
+    """
+    return func.json_each(model.quantity).table_valued(
+        "key", "value", joins_implicitly=True
+    )
+
+
+def _fetch_columns(db: Session, stmt, output: str = "columns"):
+    """
+    Execute a Core select and return its result column-wise.
+    output = "columns" -> { "col": [v1, v2, ...], ... }
+             "pandas"  -> pandas.DataFrame
+             "arrow"   -> pyarrow.Table (needs pyarrow installed)
+    """
+    result = db.execute(stmt)
+    keys = list(result.keys())
+    rows = result.all()
+
+    if rows:
+        columns = {k: list(col) for k, col in zip(keys, zip(*rows))}
+    else:
+        columns = {k: [] for k in keys}
+
+    if output == "columns":
+        return columns
+    if output == "pandas":
+        import pandas as pd
+        return pd.DataFrame(columns)
+    if output == "arrow":
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("output='arrow' requires pyarrow to be installed.") from e
+        return pa.table(columns)
+
+    raise ValueError(f"Invalid output: {output}. Allowed: columns, pandas, arrow")
+
+
+def _donation_items_select():
+    items = _line_items(FoodDonation)
+    return select(
+        FoodDonation.donation_id,
+        FoodDonation.user_id,
+        func.json_extract(items.c.value, "$.item").label("item"),
+        func.json_extract(items.c.value, "$.qty").label("qty"),
+    ).order_by(FoodDonation.donation_id.desc(), items.c.key)
+
+
+# 6) User → Past Donations, flattened to one row per item
+def get_user_donation_items(db: Session, user_id: int, output: str = "columns"):
+    stmt = _donation_items_select().where(FoodDonation.user_id == user_id)
+    return _fetch_columns(db, stmt, output)
+
+
+# 7) Admin → All Donations, flattened to one row per item
+def get_all_donation_items(db: Session, output: str = "columns"):
+    return _fetch_columns(db, _donation_items_select(), output)
+
+
+# 8) User → Distributed items matching anything the user has donated
+def get_user_distributed_items(db: Session, user_id: int, output: str = "columns"):
+    donated = _line_items(FoodDonation)
+    user_items = (
+        select(func.lower(func.json_extract(donated.c.value, "$.item")))
+        .where(FoodDonation.user_id == user_id)
+    )
+
+    items = _line_items(Distribution)
+    item_name = func.json_extract(items.c.value, "$.item")
+    stmt = (
+        select(
+            Distribution.distribution_id,
+            Distribution.address,
+            Distribution.state,
+            item_name.label("item"),
+            func.json_extract(items.c.value, "$.qty").label("qty"),
+        )
+        .where(func.lower(item_name).in_(user_items))
+        .order_by(Distribution.distribution_id.desc(), items.c.key)
+    )
+    return _fetch_columns(db, stmt, output)
@@ -4,6 +4,7 @@ import bcrypt
 from sqlalchemy.orm import Session
 from workflow.model import User, OTPStore
 from workflow.email_utils import generate_otp, send_otp_email
+from workflow.rate_limit import LOGIN_LIMITER, OTP_LIMITER
 
 # Allowed roles
 ALLOWED_ROLES = {"user", "admin", "org"}
@@ -65,12 +66,16 @@ def create_user(db: Session, email: str, username: str, password: str, role: str
     return new_user
 
 
-def authenticate_user(db: Session, email: str, password: str):
+def authenticate_user(db: Session, email: str, password: str, session_id: str = None):
     """
     Basic email + password authentication.
     Used BEFORE OTP verification.
+    Rate limited per email / session before any DB or bcrypt work
+    (raises RateLimitExceeded).
     """
     email = email.strip().lower()
+    LOGIN_LIMITER.check(email=email, session=session_id)
+
     user = db.query(User).filter(User.email == email).first()
 
     if not user:
@@ -114,12 +119,14 @@ def set_user_role(db: Session, user_id: int, new_role: str):
 # ------------------------------------------------------
 # OTP LOGIC
 # ------------------------------------------------------
-def create_and_send_otp(email: str, db: Session):
+def create_and_send_otp(email: str, db: Session, session_id: str = None):
     """
     Create a 6-digit OTP, store it with 5 min expiry,
     delete previous OTPs, and send email.
+    Rate limited per email / session (raises RateLimitExceeded).
     """
     email = email.strip().lower()
+    OTP_LIMITER.check(email=email, session=session_id)
 
     otp = generate_otp()
     expires_at = int(time.time()) + 300  # valid for 5 minutes
@@ -0,0 +1,176 @@
+# workflow/profiling.py
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Opt-in: set PROFILE_PAGES=1 in the environment / .env
+PROFILE_ENABLED = os.getenv("PROFILE_PAGES", "0") == "1"
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))          # last K renders kept
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", "25"))            # top-N hotspots per render
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "2")) / 1000
+# tracemalloc slows rendering noticeably; turn off for cleaner timings
+PROFILE_ALLOCATIONS = os.getenv("PROFILE_ALLOCATIONS", "1") == "1"
+
+# Shared by every Streamlit session in this process
+_renders = deque(maxlen=PROFILE_KEEP)
+_renders_lock = threading.Lock()
+
+# tracemalloc is process-wide, so only one render is profiled at a time
+_profile_lock = threading.Lock()
+
+
+# ------------------------------------------------------
+# STACK SAMPLER (for flamegraphs)
+# ------------------------------------------------------
+class _StackSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds
+    and counts collapsed stacks ("outer;inner;leaf").
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            # Walk up to profile_render so only the page's own frames are kept;
+            # drop samples caught inside the profiler's own bookkeeping
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                if code is profile_render.__code__:
+                    break
+                if code.co_filename == __file__:
+                    names = []
+                    break
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+
+# ------------------------------------------------------
+# RENDER PROFILING
+# ------------------------------------------------------
+def profile_render(page):
+    """
+    Run a page function and record wall/CPU time, allocations
+    and sampled stacks for it.
+    Falls back to a plain call if another render is being profiled.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return page()
+
+    sampler = _StackSampler(threading.get_ident(), PROFILE_INTERVAL)
+    started_tracing = PROFILE_ALLOCATIONS and not tracemalloc.is_tracing()
+
+    try:
+        if started_tracing:
+            tracemalloc.start()
+        if PROFILE_ALLOCATIONS:
+            tracemalloc.reset_peak()
+            mem_start, _ = tracemalloc.get_traced_memory()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        sampler.start()
+        try:
+            # st.rerun() / st.stop() raise, so record in finally
+            return page()
+        finally:
+            sampler.stop()
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+
+            alloc_kb = peak_kb = None
+            if PROFILE_ALLOCATIONS:
+                mem_end, mem_peak = tracemalloc.get_traced_memory()
+                alloc_kb = (mem_end - mem_start) / 1024
+                peak_kb = (mem_peak - mem_start) / 1024
+
+            _record({
+                "page": page.__name__,
+                "at": time.time(),
+                "wall_ms": wall * 1000,
+                "cpu_ms": cpu * 1000,
+                "alloc_kb": alloc_kb,
+                "peak_kb": peak_kb,
+                "samples": sum(sampler.stacks.values()),
+                "stacks": sampler.stacks,
+            })
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _profile_lock.release()
+
+
+def _record(render: dict):
+    with _renders_lock:
+        _renders.append(render)
+
+
+def get_recent_renders():
+    """Newest first."""
+    with _renders_lock:
+        return list(reversed(_renders))
+
+
+def collapsed_stacks(renders) -> str:
+    """
+    Merge sampled stacks of the given renders into collapsed-stack text,
+    one "frame;frame;frame count" per line (flamegraph.pl / speedscope format).
+    """
+    merged = Counter()
+    for r in renders:
+        merged.update(r["stacks"])
+
+    return "\n".join(f"{stack} {count}" for stack, count in merged.most_common()) + "\n"
+
+
+def hotspots(render: dict, top: int = PROFILE_TOP) -> str:
+    """
+    Top-N functions of one render by self samples (leaf frame),
+    with inclusive samples (anywhere on the stack) alongside.
+    """
+    own = Counter()
+    total = Counter()
+    for stack, count in render["stacks"].items():
+        frames = stack.split(";")
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+
+    samples = render["samples"] or 1
+    lines = [
+        f"{render['page']}: {render['samples']} samples, "
+        f"{render['wall_ms']:.1f} ms wall, {render['cpu_ms']:.1f} ms CPU",
+        "",
+        f"{'self %':>7} {'total %':>7}  function",
+    ]
+    for frame, count in own.most_common(top):
+        lines.append(f"{100 * count / samples:7.1f} {100 * total[frame] / samples:7.1f}  {frame}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,90 @@
+# workflow/rate_limit.py
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a caller has no tokens left; retry_after is in seconds."""
+
+    def __init__(self, limiter: str, retry_after: float):
+        self.limiter = limiter
+        self.retry_after = retry_after
+        super().__init__(f"Too many attempts. Try again in {math.ceil(retry_after)}s.")
+
+
+class TokenBucketLimiter:
+    """
+    In-process token bucket per key (e.g. "email:a@b.com", "session:<id>").
+    - capacity = burst size, refill_per_sec = sustained rate.
+    - State is one (tokens, updated_at) tuple per key in an LRU dict capped
+      at max_keys; an evicted key simply starts again with a full bucket.
+    """
+
+    def __init__(self, name: str, capacity: int, refill_per_sec: float, max_keys: int = 10_000):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.max_keys = max_keys
+        self.rejected = Counter()   # key kind → rejects, plus "total"
+
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _tokens(self, key: str, now: float) -> float:
+        state = self._buckets.get(key)
+        if state is None:
+            return float(self.capacity)
+        tokens, updated_at = state
+        return min(self.capacity, tokens + (now - updated_at) * self.refill_per_sec)
+
+    def check(self, **keys):
+        """
+        Take one token from every given key, or none of them.
+        check(email="a@b.com", session="abc")  — None values are ignored.
+        Raises RateLimitExceeded if any key is out of tokens.
+        """
+        keys = {kind: f"{kind}:{value}" for kind, value in keys.items() if value}
+        if not keys:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            tokens = {kind: self._tokens(key, now) for kind, key in keys.items()}
+            empty = [kind for kind, t in tokens.items() if t < 1]
+
+            if empty:
+                self.rejected["total"] += 1
+                for kind in empty:
+                    self.rejected[kind] += 1
+                wait = max((1 - tokens[kind]) / self.refill_per_sec for kind in empty)
+                raise RateLimitExceeded(self.name, wait)
+
+            for kind, key in keys.items():
+                self._buckets[key] = (tokens[kind] - 1, now)
+                self._buckets.move_to_end(key)
+
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+
+# ------------------------------------------------------
+# LIMITERS
+# ------------------------------------------------------
+# Login: bursts of 5, then one attempt every 30s
+LOGIN_LIMITER = TokenBucketLimiter("login", capacity=5, refill_per_sec=1 / 30)
+
+# OTP email: bursts of 3, then one send per minute
+OTP_LIMITER = TokenBucketLimiter("otp", capacity=3, refill_per_sec=1 / 60)
+
+
+def get_reject_counts():
+    """
+    Returns { "login": {"total": 3, "email": 3, "session": 1}, "otp": {...} }
+    """
+    result = {}
+    for limiter in (LOGIN_LIMITER, OTP_LIMITER):
+        with limiter._lock:
+            result[limiter.name] = dict(limiter.rejected)
+    return result